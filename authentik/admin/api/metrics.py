@@ -2,6 +2,7 @@
 
 from datetime import timedelta
 
+from django.db.models import QuerySet
 from django.db.models.functions import ExtractHour
 from drf_spectacular.utils import extend_schema, extend_schema_field
 from guardian.shortcuts import get_objects_for_user
@@ -29,14 +30,20 @@ class LoginMetricsSerializer(PassiveSerializer):
     logins_failed = SerializerMethodField()
     authorizations = SerializerMethodField()
 
+    @property
+    def events(self) -> QuerySet:
+        """Events the user has access to, resolved once and shared between all fields"""
+        if "events" not in self.context:
+            self.context["events"] = get_objects_for_user(
+                self.context["user"], "authentik_events.view_event"
+            )
+        return self.context["events"]
+
     @extend_schema_field(CoordinateSerializer(many=True))
     def get_logins(self, _):
         """Get successful logins per 8 hours for the last 7 days"""
-        user = self.context["user"]
         return (
-            get_objects_for_user(user, "authentik_events.view_event").filter(
-                action=EventAction.LOGIN
-            )
+            self.events.filter(action=EventAction.LOGIN)
             # 3 data points per day, so 8 hour spans
             .get_events_per(timedelta(days=7), ExtractHour, 7 * 3)
         )
@@ -44,11 +51,8 @@ class LoginMetricsSerializer(PassiveSerializer):
     @extend_schema_field(CoordinateSerializer(many=True))
     def get_logins_failed(self, _):
         """Get failed logins per 8 hours for the last 7 days"""
-        user = self.context["user"]
         return (
-            get_objects_for_user(user, "authentik_events.view_event").filter(
-                action=EventAction.LOGIN_FAILED
-            )
+            self.events.filter(action=EventAction.LOGIN_FAILED)
             # 3 data points per day, so 8 hour spans
             .get_events_per(timedelta(days=7), ExtractHour, 7 * 3)
         )
@@ -56,11 +60,8 @@ class LoginMetricsSerializer(PassiveSerializer):
     @extend_schema_field(CoordinateSerializer(many=True))
     def get_authorizations(self, _):
         """Get successful authorizations per 8 hours for the last 7 days"""
-        user = self.context["user"]
         return (
-            get_objects_for_user(user, "authentik_events.view_event").filter(
-                action=EventAction.AUTHORIZE_APPLICATION
-            )
+            self.events.filter(action=EventAction.AUTHORIZE_APPLICATION)
             # 3 data points per day, so 8 hour spans
             .get_events_per(timedelta(days=7), ExtractHour, 7 * 3)
         )
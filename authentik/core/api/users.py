@@ -7,6 +7,7 @@ from typing import Any
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.sessions.backends.cache import KEY_PREFIX
 from django.core.cache import cache
+from django.db.models import QuerySet
 from django.db.models.functions import ExtractHour
 from django.db.transaction import atomic
 from django.db.utils import IntegrityError
@@ -285,15 +286,21 @@ class UserMetricsSerializer(PassiveSerializer):
     logins_failed = SerializerMethodField()
     authorizations = SerializerMethodField()
 
+    @property
+    def events(self) -> QuerySet:
+        """Events the user has access to, resolved once and shared between all fields"""
+        if "events" not in self.context:
+            self.context["events"] = get_objects_for_user(
+                self.context["request"].user, "authentik_events.view_event"
+            )
+        return self.context["events"]
+
     @extend_schema_field(CoordinateSerializer(many=True))
     def get_logins(self, _):
         """Get successful logins per 8 hours for the last 7 days"""
         user = self.context["user"]
-        request = self.context["request"]
         return (
-            get_objects_for_user(request.user, "authentik_events.view_event").filter(
-                action=EventAction.LOGIN, user__pk=user.pk
-            )
+            self.events.filter(action=EventAction.LOGIN, user__pk=user.pk)
             # 3 data points per day, so 8 hour spans
             .get_events_per(timedelta(days=7), ExtractHour, 7 * 3)
         )
@@ -302,11 +309,8 @@ class UserMetricsSerializer(PassiveSerializer):
     def get_logins_failed(self, _):
         """Get failed logins per 8 hours for the last 7 days"""
         user = self.context["user"]
-        request = self.context["request"]
         return (
-            get_objects_for_user(request.user, "authentik_events.view_event").filter(
-                action=EventAction.LOGIN_FAILED, context__username=user.username
-            )
+            self.events.filter(action=EventAction.LOGIN_FAILED, context__username=user.username)
             # 3 data points per day, so 8 hour spans
             .get_events_per(timedelta(days=7), ExtractHour, 7 * 3)
         )
@@ -315,11 +319,8 @@ class UserMetricsSerializer(PassiveSerializer):
     def get_authorizations(self, _):
         """Get failed logins per 8 hours for the last 7 days"""
         user = self.context["user"]
-        request = self.context["request"]
         return (
-            get_objects_for_user(request.user, "authentik_events.view_event").filter(
-                action=EventAction.AUTHORIZE_APPLICATION, user__pk=user.pk
-            )
+            self.events.filter(action=EventAction.AUTHORIZE_APPLICATION, user__pk=user.pk)
             # 3 data points per day, so 8 hour spans
             .get_events_per(timedelta(days=7), ExtractHour, 7 * 3)
         )
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.2 on 2024-03-04 10:21
+
+import django.db.models.fields.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("authentik_core", "0033_alter_user_options"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="group",
+            index=models.Index(
+                django.db.models.fields.json.KeyTransform("ldap_uniq", "attributes"),
+                name="ak_group_ldap_uniq_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.fields.json.KeyTransform("ldap_uniq", "attributes"),
+                name="ak_user_ldap_uniq_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.2 on 2024-03-04 11:02
+
+import django.db.models.fields.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("authentik_core", "0034_group_ak_group_ldap_uniq_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.fields.json.KeyTransform("distinguishedName", "attributes"),
+                name="ak_user_ldap_dn_idx",
+            ),
+        ),
+    ]
@@ -11,6 +11,7 @@ from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.models import UserManager as DjangoUserManager
 from django.db import models
 from django.db.models import Q, QuerySet, options
+from django.db.models.fields.json import KeyTransform
 from django.http import HttpRequest
 from django.utils.functional import SimpleLazyObject, cached_property
 from django.utils.timezone import now
@@ -167,6 +168,10 @@ class Group(SerializerModel):
                 "parent",
             ),
         )
+        indexes = [
+            # Used by the LDAP source to look up synchronized groups
+            models.Index(KeyTransform("ldap_uniq", "attributes"), name="ak_group_ldap_uniq_idx"),
+        ]
         verbose_name = _("Group")
         verbose_name_plural = _("Groups")
 
@@ -305,6 +310,14 @@ class User(SerializerModel, GuardianUserMixin, AbstractUser):
             ("preview_user", _("Can preview user data sent to providers")),
             ("view_user_applications", _("View applications the user has access to")),
         ]
+        indexes = [
+            # Used by the LDAP source to look up synchronized users
+            models.Index(KeyTransform("ldap_uniq", "attributes"), name="ak_user_ldap_uniq_idx"),
+            # Used by the LDAP source to look up group members
+            models.Index(
+                KeyTransform("distinguishedName", "attributes"), name="ak_user_ldap_dn_idx"
+            ),
+        ]
         authentik_signals_ignored_fields = [
             # Logged by the events `password_set`
             # the `password_set` action/signal doesn't currently convey which user
@@ -3,8 +3,10 @@
 import re
 import socket
 from collections.abc import Iterable
+from functools import lru_cache
 from ipaddress import ip_address, ip_network
 from textwrap import indent
+from types import CodeType
 from typing import Any
 
 from cachetools import TLRUCache, cached
@@ -26,6 +28,14 @@ from authentik.stages.authenticator import devices_for_user
 LOGGER = get_logger()
 
 
+@lru_cache(maxsize=512)
+def _compile(source: str, filename: str) -> CodeType:
+    """Compile wrapped expression. Code objects are immutable and can be executed with any
+    globals and locals, so the same expression (for example a property mapping evaluated for
+    every object in a sync) is only compiled once"""
+    return compile(source, filename, "exec")
+
+
 class BaseEvaluator:
     """Validate and evaluate python-based expressions"""
 
@@ -185,7 +195,7 @@ class BaseEvaluator:
     def compile(self, expression: str) -> Any:
         """Parse expression. Raises SyntaxError or ValueError if the syntax is incorrect."""
         param_keys = self._context.keys()
-        return compile(self.wrap_expression(expression, param_keys), self._filename, "exec")
+        return _compile(self.wrap_expression(expression, param_keys), self._filename)
 
     def evaluate(self, expression_source: str) -> Any:
         """Parse and evaluate expression. If the syntax is incorrect, a SyntaxError is raised.
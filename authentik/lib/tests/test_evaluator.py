@@ -41,3 +41,12 @@ class TestEvaluator(TestCase):
         event = Event.objects.filter(action="custom_foo").first()
         self.assertIsNotNone(event)
         self.assertEqual(event.context, {"bar": "baz", "foo": "bar"})
+
+    def test_compile_cached(self):
+        """Test that the same expression is only compiled once"""
+        evaluator = BaseEvaluator(generate_id())
+        evaluator._context = {"foo": "bar"}
+        self.assertIs(evaluator.compile("return foo"), evaluator.compile("return foo"))
+        self.assertEqual(evaluator.evaluate("return foo"), "bar")
+        evaluator._context = {"foo": "baz"}
+        self.assertEqual(evaluator.evaluate("return foo"), "baz")
@@ -1,5 +1,7 @@
 """Group client"""
 
+from functools import cached_property
+
 from deepmerge import always_merger
 from pydantic import ValidationError
 from pydanticscim.group import GroupMember
@@ -24,6 +26,17 @@ from authentik.providers.scim.models import SCIMGroup, SCIMMapping, SCIMUser
 class SCIMGroupClient(SCIMClient[Group, SCIMGroupSchema]):
     """SCIM client for groups"""
 
+    @cached_property
+    def mappings(self) -> list[SCIMMapping]:
+        """SCIM mappings used for groups, only fetched once per client"""
+        return [
+            mapping
+            for mapping in (
+                self.provider.property_mappings_group.all().order_by("name").select_subclasses()
+            )
+            if isinstance(mapping, SCIMMapping)
+        ]
+
     def write(self, obj: Group):
         """Write a group"""
         scim_group = SCIMGroup.objects.filter(provider=self.provider, group=obj).first()
@@ -50,13 +63,8 @@ class SCIMGroupClient(SCIMClient[Group, SCIMGroupSchema]):
         raw_scim_group = {
             "schemas": ("urn:ietf:params:scim:schemas:core:2.0:Group",),
         }
-        for mapping in (
-            self.provider.property_mappings_group.all().order_by("name").select_subclasses()
-        ):
-            if not isinstance(mapping, SCIMMapping):
-                continue
+        for mapping in self.mappings:
             try:
-                mapping: SCIMMapping
                 value = mapping.evaluate(
                     user=None,
                     request=None,
@@ -1,5 +1,7 @@
 """User client"""
 
+from functools import cached_property
+
 from deepmerge import always_merger
 from pydantic import ValidationError
 
@@ -17,6 +19,17 @@ from authentik.providers.scim.models import SCIMMapping, SCIMUser
 class SCIMUserClient(SCIMClient[User, SCIMUserSchema]):
     """SCIM client for users"""
 
+    @cached_property
+    def mappings(self) -> list[SCIMMapping]:
+        """SCIM mappings used for users, only fetched once per client"""
+        return [
+            mapping
+            for mapping in (
+                self.provider.property_mappings.all().order_by("name").select_subclasses()
+            )
+            if isinstance(mapping, SCIMMapping)
+        ]
+
     def write(self, obj: User):
         """Write a user"""
         scim_user = SCIMUser.objects.filter(provider=self.provider, user=obj).first()
@@ -43,11 +56,8 @@ class SCIMUserClient(SCIMClient[User, SCIMUserSchema]):
         raw_scim_user = {
             "schemas": ("urn:ietf:params:scim:schemas:core:2.0:User",),
         }
-        for mapping in self.provider.property_mappings.all().order_by("name").select_subclasses():
-            if not isinstance(mapping, SCIMMapping):
-                continue
+        for mapping in self.mappings:
             try:
-                mapping: SCIMMapping
                 value = mapping.evaluate(
                     user=obj,
                     request=None,
@@ -41,6 +41,9 @@ class LDAPSourceSerializer(SourceSerializer):
 
     def get_connectivity(self, source: LDAPSource) -> dict[str, dict[str, str]] | None:
         """Get cached source connectivity"""
+        # When listing sources, the connectivity of all sources is fetched at once
+        if "connectivity" in self.context:
+            return self.context["connectivity"].get(CACHE_KEY_STATUS + source.slug, None)
         return cache.get(CACHE_KEY_STATUS + source.slug, None)
 
     def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
@@ -128,6 +131,21 @@ class LDAPSourceViewSet(UsedByMixin, ModelViewSet):
     search_fields = ["name", "slug"]
     ordering = ["name"]
 
+    # Keep the description from the viewset, instead of using this method's docstring
+    @extend_schema(description="LDAP Source Viewset")
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        """Custom list method that fetches the cached connectivity of all sources at once"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        sources = page if page is not None else list(queryset)
+        serializer = self.get_serializer(sources, many=True)
+        serializer.context["connectivity"] = cache.get_many(
+            [CACHE_KEY_STATUS + source.slug for source in sources]
+        )
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
     @extend_schema(
         responses={
             200: LDAPSyncStatusSerializer(),
@@ -10,7 +10,12 @@ from django.core.cache import cache
 from django.db import connection, models
 from django.utils.translation import gettext_lazy as _
 from ldap3 import ALL, NONE, RANDOM, Connection, Server, ServerPool, Tls
-from ldap3.core.exceptions import LDAPException, LDAPInsufficientAccessRightsResult, LDAPSchemaError
+from ldap3.core.exceptions import (
+    LDAPBindError,
+    LDAPException,
+    LDAPInsufficientAccessRightsResult,
+    LDAPSchemaError,
+)
 from redis.lock import Lock
 from rest_framework.serializers import Serializer
 
@@ -196,7 +201,7 @@ class LDAPSource(Source):
                 conn.server.tls.certificate_file
             ):
                 rmtree(dirname(conn.server.tls.certificate_file))
-        return RuntimeError("Failed to bind")
+        raise LDAPBindError("Failed to bind")
 
     @property
     def sync_lock(self) -> Lock:
@@ -221,11 +226,14 @@ class LDAPSource(Source):
             server: Server
             try:
                 conn = self.connection(server=server)
-                server_info[server.host] = {
-                    "vendor": str(flatten(conn.server.info.vendor_name)),
-                    "version": str(flatten(conn.server.info.vendor_version)),
-                    "status": "ok",
-                }
+                try:
+                    server_info[server.host] = {
+                        "vendor": str(flatten(conn.server.info.vendor_name)),
+                        "version": str(flatten(conn.server.info.vendor_version)),
+                        "status": "ok",
+                    }
+                finally:
+                    conn.unbind()
             except LDAPException as exc:
                 server_info[server.host] = {
                     "status": str(exc),
@@ -233,11 +241,14 @@ class LDAPSource(Source):
         # Check server pool
         try:
             conn = self.connection()
-            server_info["__all__"] = {
-                "vendor": str(flatten(conn.server.info.vendor_name)),
-                "version": str(flatten(conn.server.info.vendor_version)),
-                "status": "ok",
-            }
+            try:
+                server_info["__all__"] = {
+                    "vendor": str(flatten(conn.server.info.vendor_name)),
+                    "version": str(flatten(conn.server.info.vendor_version)),
+                    "status": "ok",
+                }
+            finally:
+                conn.unbind()
         except LDAPException as exc:
             server_info["__all__"] = {
                 "status": str(exc),
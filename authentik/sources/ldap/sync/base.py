@@ -1,11 +1,18 @@
 """Sync LDAP Users and groups into authentik"""
 
 from collections.abc import Generator
+from copy import deepcopy
+from functools import cached_property
+from json import dumps
 from typing import Any
 
 from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, FieldError
+from django.db import transaction
 from django.db.models.base import Model
 from django.db.models.query import QuerySet
+from django.db.models.signals import post_save
+from django.db.utils import IntegrityError
 from ldap3 import DEREF_ALWAYS, SUBTREE, Connection
 from structlog.stdlib import BoundLogger, get_logger
 
@@ -17,6 +24,8 @@ from authentik.sources.ldap.auth import LDAP_DISTINGUISHED_NAME
 from authentik.sources.ldap.models import LDAPPropertyMapping, LDAPSource
 
 LDAP_UNIQUENESS = "ldap_uniq"
+BULK_BATCH_SIZE = 500
+BULK_ERRORS = (IntegrityError, FieldError, TypeError, AttributeError)
 
 
 def flatten(value: Any) -> Any:
@@ -33,15 +42,18 @@ class BaseLDAPSynchronizer:
 
     _source: LDAPSource
     _logger: BoundLogger
-    _connection: Connection
     _messages: list[str]
 
     def __init__(self, source: LDAPSource):
         self._source = source
-        self._connection = source.connection()
         self._messages = []
         self._logger = get_logger().bind(source=source, syncer=self.__class__.__name__)
 
+    @cached_property
+    def _connection(self) -> Connection:
+        """LDAP Connection, only connected and bound when it's first used"""
+        return self._source.connection()
+
     @staticmethod
     def name() -> str:
         """UI name for the type of object this class synchronizes"""
@@ -134,32 +146,50 @@ class BaseLDAPSynchronizer:
                 cookie = None
             yield self._connection.response
 
+    @cached_property
+    def user_path(self) -> str:
+        """Default path for synced users, only templated once per synchronizer"""
+        return self._source.get_user_path()
+
+    @cached_property
+    def user_mappings(self) -> list[LDAPPropertyMapping]:
+        """LDAP Property mappings used for users, only fetched once per synchronizer"""
+        return self._get_mappings(self._source.property_mappings)
+
+    @cached_property
+    def group_mappings(self) -> list[LDAPPropertyMapping]:
+        """LDAP Property mappings used for groups, only fetched once per synchronizer"""
+        return self._get_mappings(self._source.property_mappings_group)
+
+    def _get_mappings(self, mappings: QuerySet) -> list[LDAPPropertyMapping]:
+        return [
+            mapping
+            for mapping in mappings.all().select_subclasses()
+            if isinstance(mapping, LDAPPropertyMapping)
+        ]
+
     def build_user_properties(self, user_dn: str, **kwargs) -> dict[str, Any]:
         """Build attributes for User object based on property mappings."""
-        props = self._build_object_properties(user_dn, self._source.property_mappings, **kwargs)
-        props.setdefault("path", self._source.get_user_path())
+        props = self._build_object_properties(user_dn, self.user_mappings, **kwargs)
+        if "path" not in props:
+            props["path"] = self.user_path
         return props
 
     def build_group_properties(self, group_dn: str, **kwargs) -> dict[str, Any]:
         """Build attributes for Group object based on property mappings."""
-        return self._build_object_properties(
-            group_dn, self._source.property_mappings_group, **kwargs
-        )
+        return self._build_object_properties(group_dn, self.group_mappings, **kwargs)
 
     def _build_object_properties(
-        self, object_dn: str, mappings: QuerySet, **kwargs
+        self, object_dn: str, mappings: list[LDAPPropertyMapping], **kwargs
     ) -> dict[str, dict[Any, Any]]:
         properties = {"attributes": {}}
-        for mapping in mappings.all().select_subclasses():
-            if not isinstance(mapping, LDAPPropertyMapping):
-                continue
-            mapping: LDAPPropertyMapping
+        for mapping in mappings:
             try:
                 value = mapping.evaluate(
                     user=None, request=None, ldap=kwargs, dn=object_dn, source=self._source
                 )
                 if value is None:
-                    self._logger.warning("property mapping returned None", mapping=mapping)
+                    self._logger.debug("property mapping returned None", mapping=mapping)
                     continue
                 if isinstance(value, (bytes)):
                     self._logger.warning("property mapping returned bytes", mapping=mapping)
@@ -187,23 +217,220 @@ class BaseLDAPSynchronizer:
         properties["attributes"][LDAP_DISTINGUISHED_NAME] = object_dn
         return properties
 
-    def update_or_create_attributes(
-        self,
-        obj: type[Model],
-        query: dict[str, Any],
-        data: dict[str, Any],
-    ) -> tuple[Model, bool]:
-        """Same as django's update_or_create but correctly update attributes by merging dicts"""
-        instance = obj.objects.filter(**query).first()
-        if not instance:
-            return (obj.objects.create(**data), True)
+    def get_existing_objects(self, obj: type[Model], page_data: list) -> dict[Any, Model]:
+        """Get all objects of type `obj` which already exist for the entries in `page_data`
+        with a single query, keyed by their uniqueness value"""
+        uniqs = []
+        for entry in page_data:
+            attributes = entry.get("attributes", {})
+            if self._source.object_uniqueness_field not in attributes:
+                continue
+            uniq = flatten(attributes[self._source.object_uniqueness_field])
+            if uniq is None:
+                continue
+            try:
+                dumps(uniq)
+            except (TypeError, ValueError):
+                # Can't be used in a JSON lookup (for example binary values), skip it here
+                # so only this object fails when it's synced, not the whole page
+                continue
+            uniqs.append(uniq)
+        existing = {}
+        if not uniqs:
+            return existing
+        # Ordered by primary key so that, like with `.first()`, the same object is picked
+        # every time when multiple objects share a uniqueness value
+        for instance in obj.objects.filter(
+            **{f"attributes__{LDAP_UNIQUENESS}__in": uniqs}
+        ).order_by("pk"):
+            existing.setdefault(instance.attributes.get(LDAP_UNIQUENESS), instance)
+        return existing
+
+    def get_object_properties(self, object_dn: str, **kwargs) -> dict[str, Any]:
+        """Build the properties of the object for an LDAP entry, implemented in subclass"""
+        raise NotImplementedError()
+
+    def before_create(self, instance: Model, attributes: dict[str, Any]):
+        """Called for each new object before it is created, can be overridden in subclass"""
+
+    def sync_objects(
+        self, obj: type[Model], page_data: list, object_name: str
+    ) -> list[tuple[Model, dict[str, Any], bool]]:
+        """Create or update an `obj` for every entry in `page_data`, writing them in bulk.
+        Objects that fail are reported with an event, `object_name` is used in messages.
+        Returns each synced object with its LDAP attributes and whether it was created"""
+        existing = self.get_existing_objects(obj, page_data)
+        # Objects are collected and written in bulk once the whole page is processed
+        new_objects: dict[Any, tuple[Model, dict[str, Any], str]] = {}
+        updated_objects: dict[Any, tuple[Model, dict[str, Any], str]] = {}
+        unchanged_objects: dict[Any, tuple[Model, dict[str, Any], str]] = {}
+        update_fields = set()
+        for entry in page_data:
+            if "attributes" not in entry:
+                continue
+            attributes = entry.get("attributes", {})
+            object_dn = flatten(entry.get("entryDN", entry.get("dn")))
+            if self._source.object_uniqueness_field not in attributes:
+                self.message(
+                    f"Cannot find uniqueness field in attributes: '{object_dn}'",
+                    attributes=attributes.keys(),
+                    dn=object_dn,
+                )
+                continue
+            uniq = flatten(attributes[self._source.object_uniqueness_field])
+            try:
+                defaults = self.get_object_properties(object_dn, **attributes)
+                self._logger.debug(f"Writing {object_name} with attributes", **defaults)
+                if uniq in existing:
+                    instance = existing[uniq]
+                    changed_fields = self.update_attributes(instance, defaults)
+                    if changed_fields or uniq in updated_objects:
+                        update_fields |= changed_fields
+                        unchanged_objects.pop(uniq, None)
+                        updated_objects[uniq] = (instance, attributes, object_dn)
+                    else:
+                        unchanged_objects[uniq] = (instance, attributes, object_dn)
+                elif uniq in new_objects:
+                    instance = new_objects[uniq][0]
+                    self.update_attributes(instance, defaults)
+                    # Like for existing objects, keep the LDAP data of the latest entry
+                    new_objects[uniq] = (instance, attributes, object_dn)
+                else:
+                    new_objects[uniq] = (obj(**defaults), attributes, object_dn)
+            except BULK_ERRORS as exc:
+                self.object_failed(exc, uniq, object_dn, object_name)
+        updated = self.bulk_update_objects(
+            obj, [instance for instance, _, _ in updated_objects.values()], update_fields
+        )
+        for instance, attributes, _ in new_objects.values():
+            self.before_create(instance, attributes)
+        created = self.bulk_create_objects(
+            obj, [instance for instance, _, _ in new_objects.values()]
+        )
+        # Unchanged objects aren't written, but are still returned as synced
+        unchanged = [(instance, None) for instance, _, _ in unchanged_objects.values()]
+        synced = []
+        for objects, results, was_created in (
+            (unchanged_objects, unchanged, False),
+            (updated_objects, updated, False),
+            (new_objects, created, True),
+        ):
+            for (uniq, (_, attributes, object_dn)), (instance, exc) in zip(
+                objects.items(), results, strict=True
+            ):
+                if exc:
+                    self.object_failed(exc, uniq, object_dn, object_name)
+                    continue
+                synced.append((instance, attributes, was_created))
+        return synced
+
+    def object_failed(self, exc: Exception, uniq: Any, object_dn: str, object_name: str):
+        """Create an event for an object that couldn't be synced"""
+        Event.new(
+            EventAction.CONFIGURATION_ERROR,
+            message=(
+                f"Failed to create {object_name}: {str(exc)} "
+                f"To merge new {object_name} with existing {object_name}, set the "
+                f"{object_name}'s Attribute '{LDAP_UNIQUENESS}' to '{uniq}'"
+            ),
+            source=self._source,
+            dn=object_dn,
+        ).save()
+
+    def update_attributes(self, instance: Model, data: dict[str, Any]) -> set[str]:
+        """Update `instance` in-memory with `data`, merging attributes instead of replacing them.
+        Returns the names of all fields whose value changed, so unchanged objects
+        don't have to be written to the database"""
+        fields = set()
         for key, value in data.items():
             if key == "attributes":
                 continue
+            if self._value_changed(instance, key, value):
+                fields.add(key)
             setattr(instance, key, value)
-        final_attributes = {}
-        MERGE_LIST_UNIQUE.merge(final_attributes, instance.attributes)
-        MERGE_LIST_UNIQUE.merge(final_attributes, data.get("attributes", {}))
-        instance.attributes = final_attributes
-        instance.save()
-        return (instance, False)
+        # Lists are merged and not replaced, so new values that differ from the existing ones
+        # can still result in the same attributes; only compare the merged result
+        attributes = deepcopy(instance.attributes)
+        MERGE_LIST_UNIQUE.merge(attributes, data.get("attributes", {}))
+        if attributes != instance.attributes:
+            fields.add("attributes")
+            instance.attributes = attributes
+        return fields
+
+    def _value_changed(self, instance: Model, key: str, value: Any) -> bool:
+        """Check if setting `key` to `value` changes a field of `instance`"""
+        try:
+            field = instance._meta.get_field(key)
+        except FieldDoesNotExist:
+            # Not a database field, so nothing to save
+            return False
+        if field.many_to_one:
+            # Compare the primary key to not fetch the related object from the database
+            return getattr(instance, field.attname) != getattr(value, "pk", value)
+        return getattr(instance, key) != value
+
+    def bulk_create_objects(
+        self, obj: type[Model], instances: list[Model]
+    ) -> list[tuple[Model, Exception | None]]:
+        """Create all `instances` in batches. If that fails (for example due to a
+        uniqueness conflict), the objects are created one-by-one so only the conflicting
+        objects fail. Returns each instance with the exception it failed with, if any."""
+        if not instances:
+            return []
+        try:
+            with transaction.atomic():
+                obj.objects.bulk_create(instances, batch_size=BULK_BATCH_SIZE)
+        except BULK_ERRORS:
+            return self._save_each(instances, force_insert=True)
+        self._send_post_save(obj, instances, created=True)
+        return [(instance, None) for instance in instances]
+
+    def bulk_update_objects(
+        self, obj: type[Model], instances: list[Model], fields: set[str]
+    ) -> list[tuple[Model, Exception | None]]:
+        """Update `fields` of all `instances` in batches. Keys set by mappings which are not
+        model fields are ignored. If updating fails, the objects are saved one-by-one so only
+        the conflicting objects fail. Returns each instance with the exception it failed
+        with, if any."""
+        if not instances:
+            return []
+        model_fields = {field.name for field in obj._meta.concrete_fields}
+        update_fields = fields & model_fields
+        try:
+            with transaction.atomic():
+                obj.objects.bulk_update(instances, update_fields, batch_size=BULK_BATCH_SIZE)
+        except BULK_ERRORS:
+            return self._save_each(instances, update_fields=update_fields)
+        self._send_post_save(obj, instances, created=False, update_fields=update_fields)
+        return [(instance, None) for instance in instances]
+
+    def _save_each(self, instances: list[Model], **kwargs) -> list[tuple[Model, Exception | None]]:
+        results = []
+        for instance in instances:
+            try:
+                with transaction.atomic():
+                    instance.save(**kwargs)
+            except BULK_ERRORS as exc:
+                results.append((instance, exc))
+            else:
+                results.append((instance, None))
+        return results
+
+    def _send_post_save(
+        self,
+        obj: type[Model],
+        instances: list[Model],
+        created: bool,
+        update_fields: set[str] | None = None,
+    ):
+        # bulk_create and bulk_update don't send post_save, which other parts of authentik
+        # (like SCIM providers) rely on to pick up changed objects
+        for instance in instances:
+            post_save.send(
+                sender=obj,
+                instance=instance,
+                created=created,
+                update_fields=frozenset(update_fields) if update_fields else None,
+                raw=False,
+                using=instance._state.db,
+            )
@@ -3,7 +3,6 @@
 from collections.abc import Generator
 from typing import Any
 
-from django.db.models import Q
 from ldap3 import SUBTREE
 
 from authentik.core.models import Group, User
@@ -47,6 +46,8 @@ class MembershipLDAPSynchronizer(BaseLDAPSynchronizer):
             self.message("Group syncing is disabled for this Source")
             return -1
         membership_count = 0
+        # Fetch all groups of this page at once instead of one query per group
+        self.group_cache.update(self.get_existing_objects(Group, page_data))
         for group in page_data:
             if "attributes" not in group:
                 continue
@@ -61,17 +62,17 @@ class MembershipLDAPSynchronizer(BaseLDAPSynchronizer):
                 # attribute we use the RDN instead of the FDN to lookup members.
                 membership_mapping_attribute = LDAP_UNIQUENESS
 
-            users = User.objects.filter(
-                Q(**{f"attributes__{membership_mapping_attribute}__in": members})
-                | Q(
-                    **{
-                        f"attributes__{membership_mapping_attribute}__isnull": True,
-                        "ak_groups__in": [ak_group],
-                    }
-                )
+            # Two separate queries instead of one OR across the user and membership tables,
+            # so the lookup by the mapping attribute can use its index
+            users = list(
+                User.objects.filter(**{f"attributes__{membership_mapping_attribute}__in": members})
+            )
+            # Keep existing members which weren't synced from LDAP
+            users += ak_group.users.filter(
+                **{f"attributes__{membership_mapping_attribute}__isnull": True}
             )
             membership_count += 1
-            membership_count += users.count()
+            membership_count += len(users)
             ak_group.users.set(users)
             ak_group.save()
         self._logger.debug("Successfully updated group membership")
@@ -91,13 +92,13 @@ class MembershipLDAPSynchronizer(BaseLDAPSynchronizer):
                 return None
             group_uniq = group_uniq[0]
         if group_uniq not in self.group_cache:
-            groups = Group.objects.filter(**{f"attributes__{LDAP_UNIQUENESS}": group_uniq})
-            if not groups.exists():
+            group = Group.objects.filter(**{f"attributes__{LDAP_UNIQUENESS}": group_uniq}).first()
+            if not group:
                 if self._source.sync_groups:
                     self.message(
                         f"Group does not exist in our DB yet, run sync_groups first: '{group_dn}'",
                         group=group_dn,
                     )
                 return None
-            self.group_cache[group_uniq] = groups.first()
+            self.group_cache[group_uniq] = group
         return self.group_cache[group_uniq]
@@ -1,14 +1,13 @@
 """Sync LDAP Users into authentik"""
 
 from collections.abc import Generator
+from typing import Any
 
-from django.core.exceptions import FieldError
 from django.db.utils import IntegrityError
 from ldap3 import ALL_ATTRIBUTES, ALL_OPERATIONAL_ATTRIBUTES, SUBTREE
 
 from authentik.core.models import User
-from authentik.events.models import Event, EventAction
-from authentik.sources.ldap.sync.base import LDAP_UNIQUENESS, BaseLDAPSynchronizer, flatten
+from authentik.sources.ldap.sync.base import BaseLDAPSynchronizer
 from authentik.sources.ldap.sync.vendor.freeipa import FreeIPA
 from authentik.sources.ldap.sync.vendor.ms_ad import MicrosoftActiveDirectory
 
@@ -37,42 +36,37 @@ class UserLDAPSynchronizer(BaseLDAPSynchronizer):
         if not self._source.sync_users:
             self.message("User syncing is disabled for this Source")
             return -1
+        if not self.user_mappings:
+            # Without any mappings no object can be valid, so don't evaluate each one
+            self.message("User syncing is skipped as no property mappings are configured")
+            return 0
         user_count = 0
-        for user in page_data:
-            if "attributes" not in user:
-                continue
-            attributes = user.get("attributes", {})
-            user_dn = flatten(user.get("entryDN", user.get("dn")))
-            if self._source.object_uniqueness_field not in attributes:
-                self.message(
-                    f"Cannot find uniqueness field in attributes: '{user_dn}'",
-                    attributes=attributes.keys(),
-                    dn=user_dn,
-                )
-                continue
-            uniq = flatten(attributes[self._source.object_uniqueness_field])
-            try:
-                defaults = self.build_user_properties(user_dn, **attributes)
-                self._logger.debug("Writing user with attributes", **defaults)
-                if "username" not in defaults:
-                    raise IntegrityError("Username was not set by propertymappings")
-                ak_user, created = self.update_or_create_attributes(
-                    User, {f"attributes__{LDAP_UNIQUENESS}": uniq}, defaults
-                )
-            except (IntegrityError, FieldError, TypeError, AttributeError) as exc:
-                Event.new(
-                    EventAction.CONFIGURATION_ERROR,
-                    message=(
-                        f"Failed to create user: {str(exc)} "
-                        "To merge new user with existing user, set the user's "
-                        f"Attribute '{LDAP_UNIQUENESS}' to '{uniq}'"
-                    ),
-                    source=self._source,
-                    dn=user_dn,
-                ).save()
-            else:
-                self._logger.debug("Synced User", user=ak_user.username, created=created)
-                user_count += 1
-                MicrosoftActiveDirectory(self._source).sync(attributes, ak_user, created)
-                FreeIPA(self._source).sync(attributes, ak_user, created)
+        for ak_user, attributes, created in self.sync_objects(User, page_data, "user"):
+            self.user_synced(ak_user, attributes, created)
+            user_count += 1
         return user_count
+
+    def get_object_properties(self, object_dn: str, **kwargs) -> dict[str, Any]:
+        properties = self.build_user_properties(object_dn, **kwargs)
+        if "username" not in properties:
+            raise IntegrityError("Username was not set by propertymappings")
+        return properties
+
+    def before_create(self, instance: User, attributes: dict[str, Any]):
+        # Apply vendor-specific changes to new users before they're created, so they are
+        # part of the same INSERT instead of a separate UPDATE per user
+        self.vendor_sync(attributes, instance, True)
+
+    def user_synced(self, ak_user: User, attributes: dict[str, Any], created: bool):
+        """Run vendor-specific sync steps for a user that was synced"""
+        self._logger.debug("Synced User", user=ak_user.username, created=created)
+        if created:
+            # Already done before the user was created
+            return
+        self.vendor_sync(attributes, ak_user, created)
+
+    def vendor_sync(self, attributes: dict[str, Any], ak_user: User, created: bool):
+        """Run vendor-specific sync steps. Users that aren't saved yet are only
+        updated in-memory"""
+        MicrosoftActiveDirectory(self._source).sync(attributes, ak_user, created)
+        FreeIPA(self._source).sync(attributes, ak_user, created)
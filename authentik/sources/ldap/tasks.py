@@ -34,21 +34,30 @@ CACHE_KEY_STATUS = "goauthentik.io/sources/ldap/status/"
 @CELERY_APP.task()
 def ldap_sync_all():
     """Sync all sources"""
-    for source in LDAPSource.objects.filter(enabled=True):
-        ldap_sync_single.apply_async(args=[str(source.pk)])
+    for source_pk in LDAPSource.objects.filter(enabled=True).values_list("pk", flat=True):
+        ldap_sync_single.apply_async(args=[str(source_pk)])
 
 
 @CELERY_APP.task()
 def ldap_connectivity_check(pk: str | None = None):
-    """Check connectivity for LDAP Sources"""
+    """Check connectivity for LDAP Sources. With `pk`, the given source is checked and its
+    status is cached. Without `pk`, one task per enabled source is started to check all of
+    them in parallel"""
+    if not pk:
+        # Check each source in its own task, so the checks (which mostly wait on the
+        # network) run in parallel instead of one after the other
+        group(
+            ldap_connectivity_check.si(str(source_pk))
+            for source_pk in LDAPSource.objects.filter(enabled=True).values_list("pk", flat=True)
+        ).apply_async()
+        return
     # 2 hour timeout, this task should run every hour
     timeout = 60 * 60 * 2
-    sources = LDAPSource.objects.filter(enabled=True)
-    if pk:
-        sources = sources.filter(pk=pk)
-    for source in sources:
-        status = source.check_connection()
-        cache.set(CACHE_KEY_STATUS + source.slug, status, timeout=timeout)
+    source = LDAPSource.objects.filter(enabled=True, pk=pk).first()
+    if not source:
+        return
+    status = source.check_connection()
+    cache.set(CACHE_KEY_STATUS + source.slug, status, timeout=timeout)
 
 
 @CELERY_APP.task(
@@ -64,29 +73,32 @@ def ldap_sync_single(source_pk: str):
     if not source:
         return
     lock = source.sync_lock
-    if lock.locked():
+    # Checking and acquiring the lock in one step, so two tasks can't both see the
+    # lock as free and then wait on each other
+    if not lock.acquire(blocking=False):
         LOGGER.debug("LDAP sync locked, skipping task", source=source.slug)
         return
     try:
-        with lock:
-            # Delete all sync tasks from the cache
-            DBSystemTask.objects.filter(name="ldap_sync", uid__startswith=source.slug).delete()
-            task = chain(
-                # User and group sync can happen at once, they have no dependencies on each other
-                group(
-                    ldap_sync_paginator(source, UserLDAPSynchronizer)
-                    + ldap_sync_paginator(source, GroupLDAPSynchronizer),
-                ),
-                # Membership sync needs to run afterwards
-                group(
-                    ldap_sync_paginator(source, MembershipLDAPSynchronizer),
-                ),
-            )
-            task()
-    except LockError:
-        # This should never happen, we check if the lock is locked above so this
-        # would only happen if there was some other timeout
-        LOGGER.debug("Failed to acquire lock for LDAP sync", source=source.slug)
+        # Delete all sync tasks from the cache
+        DBSystemTask.objects.filter(name="ldap_sync", uid__startswith=source.slug).delete()
+        task = chain(
+            # User and group sync can happen at once, they have no dependencies on each other
+            group(
+                ldap_sync_paginator(source, UserLDAPSynchronizer)
+                + ldap_sync_paginator(source, GroupLDAPSynchronizer),
+            ),
+            # Membership sync needs to run afterwards
+            group(
+                ldap_sync_paginator(source, MembershipLDAPSynchronizer),
+            ),
+        )
+        task()
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            # This would only happen if the lock timed out before we were done
+            LOGGER.debug("Failed to release lock for LDAP sync", source=source.slug)
 
 
 def ldap_sync_paginator(source: LDAPSource, sync: type[BaseLDAPSynchronizer]) -> list:
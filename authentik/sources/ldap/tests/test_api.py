@@ -1,10 +1,14 @@
 """LDAP Source API tests"""
 
+from django.core.cache import cache
+from django.urls import reverse
 from rest_framework.test import APITestCase
 
-from authentik.lib.generators import generate_key
+from authentik.core.tests.utils import create_test_admin_user
+from authentik.lib.generators import generate_id, generate_key
 from authentik.sources.ldap.api import LDAPSourceSerializer
 from authentik.sources.ldap.models import LDAPSource
+from authentik.sources.ldap.tasks import CACHE_KEY_STATUS
 
 LDAP_PASSWORD = generate_key()
 
@@ -50,3 +54,19 @@ class LDAPAPITests(APITestCase):
             }
         )
         self.assertFalse(serializer.is_valid())
+
+    def test_list_connectivity(self):
+        """Test that listing sources includes their cached connectivity"""
+        source = LDAPSource.objects.create(
+            name=generate_id(),
+            slug=generate_id(),
+            server_uri="ldaps://1.2.3.4",
+            base_dn="dc=foo",
+        )
+        status = {"__all__": {"status": "ok"}}
+        cache.set(CACHE_KEY_STATUS + source.slug, status)
+        self.client.force_login(create_test_admin_user())
+        response = self.client.get(reverse("authentik_api:ldapsource-list"))
+        self.assertEqual(response.status_code, 200)
+        result = [x for x in response.json()["results"] if x["slug"] == source.slug]
+        self.assertEqual(result[0]["connectivity"], status)
@@ -7,7 +7,7 @@ from django.test import TestCase
 
 from authentik.blueprints.tests import apply_blueprint
 from authentik.core.models import User
-from authentik.lib.generators import generate_key
+from authentik.lib.generators import generate_id, generate_key
 from authentik.sources.ldap.auth import LDAPBackend
 from authentik.sources.ldap.models import LDAPPropertyMapping, LDAPSource
 from authentik.sources.ldap.sync.users import UserLDAPSynchronizer
@@ -61,6 +61,19 @@ class LDAPSyncTests(TestCase):
             )
             bind_mock.assert_not_called()
 
+    def test_auth_bind_unsuccessful(self):
+        """Test that a bind which fails without raising an exception doesn't authenticate"""
+        self.source.server_uri = "ldap://localhost"
+        user = User.objects.create(
+            username=generate_id(),
+            attributes={"distinguishedName": "cn=user0,ou=users,dc=goauthentik,dc=io"},
+        )
+        with patch("authentik.sources.ldap.models.Connection.bind", MagicMock(return_value=False)):
+            self.assertIsNone(LDAPBackend().auth_user_by_bind(self.source, user, LDAP_PASSWORD))
+            status = self.source.check_connection()
+        self.assertEqual(status["localhost"]["status"], "Failed to bind")
+        self.assertEqual(status["__all__"]["status"], "Failed to bind")
+
     def test_auth_synced_user_ad(self):
         """Test Cached auth"""
         self.source.property_mappings.set(
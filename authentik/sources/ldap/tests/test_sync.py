@@ -2,7 +2,9 @@
 
 from unittest.mock import MagicMock, patch
 
+from django.core.cache import cache
 from django.db.models import Q
+from django.db.models.signals import post_save
 from django.test import TestCase
 
 from authentik.blueprints.tests import apply_blueprint
@@ -16,7 +18,13 @@ from authentik.sources.ldap.models import LDAPPropertyMapping, LDAPSource
 from authentik.sources.ldap.sync.groups import GroupLDAPSynchronizer
 from authentik.sources.ldap.sync.membership import MembershipLDAPSynchronizer
 from authentik.sources.ldap.sync.users import UserLDAPSynchronizer
-from authentik.sources.ldap.tasks import ldap_sync, ldap_sync_all
+from authentik.sources.ldap.sync.vendor.ms_ad import UserAccountControl
+from authentik.sources.ldap.tasks import (
+    CACHE_KEY_STATUS,
+    ldap_connectivity_check,
+    ldap_sync,
+    ldap_sync_all,
+)
 from authentik.sources.ldap.tests.mock_ad import mock_ad_connection
 from authentik.sources.ldap.tests.mock_freeipa import mock_freeipa_connection
 from authentik.sources.ldap.tests.mock_slapd import mock_slapd_connection
@@ -127,6 +135,214 @@ class LDAPSyncTests(TestCase):
             self.assertEqual(user.path, "goauthentik.io/sources/ldap/users/foo")
             self.assertFalse(User.objects.filter(username="user1_sn").exists())
 
+    def test_sync_users_ad_conflict(self):
+        """Test that a conflicting user only fails itself and doesn't prevent the
+        other users from being created"""
+        self.source.property_mappings.set(
+            LDAPPropertyMapping.objects.filter(
+                Q(managed__startswith="goauthentik.io/sources/ldap/default")
+                | Q(managed__startswith="goauthentik.io/sources/ldap/ms")
+            )
+        )
+        connection = MagicMock(return_value=mock_ad_connection(LDAP_PASSWORD))
+        # Not linked to the LDAP user, so creating it fails due to the username
+        User.objects.create(username="user0_sn")
+        receiver = MagicMock()
+        post_save.connect(receiver, sender=User, weak=False)
+        try:
+            with patch("authentik.sources.ldap.models.LDAPSource.connection", connection):
+                UserLDAPSynchronizer(self.source).sync_full()
+        finally:
+            post_save.disconnect(receiver, sender=User)
+        self.assertEqual(User.objects.filter(username="user0_sn").count(), 1)
+        self.assertTrue(User.objects.filter(username="sAMAccountName").exists())
+        self.assertTrue(User.objects.filter(username="user2_sn").exists())
+        events = Event.objects.filter(
+            action=EventAction.CONFIGURATION_ERROR,
+            context__message__startswith="Failed to create user",
+        )
+        self.assertEqual(events.count(), 1)
+        self.assertEqual(events.first().context["dn"], "cn=user0,ou=users,dc=goauthentik,dc=io")
+        created = [
+            call.kwargs["instance"].username
+            for call in receiver.call_args_list
+            if call.kwargs["created"]
+        ]
+        self.assertCountEqual(created, ["sAMAccountName", "user2_sn"])
+
+    def test_sync_users_invalid_uniq(self):
+        """Test that an entry whose uniqueness value can't be stored only fails itself"""
+        self.source.property_mappings.set(
+            LDAPPropertyMapping.objects.filter(
+                Q(managed__startswith="goauthentik.io/sources/ldap/default")
+                | Q(managed__startswith="goauthentik.io/sources/ldap/ms")
+            )
+        )
+        bad_dn = "cn=bad,ou=users,dc=goauthentik,dc=io"
+        good_dn = "cn=good,ou=users,dc=goauthentik,dc=io"
+        page = [
+            {
+                "dn": bad_dn,
+                "attributes": {
+                    "objectSid": b"\x01\x05\x00",
+                    "sAMAccountName": "bad_sn",
+                    "name": "bad_sn",
+                    "distinguishedName": bad_dn,
+                },
+            },
+            {
+                "dn": good_dn,
+                "attributes": {
+                    "objectSid": generate_id(),
+                    "sAMAccountName": "good_sn",
+                    "name": "good_sn",
+                    "distinguishedName": good_dn,
+                },
+            },
+        ]
+        self.assertEqual(UserLDAPSynchronizer(self.source).sync(page), 1)
+        self.assertTrue(User.objects.filter(username="good_sn").exists())
+        self.assertFalse(User.objects.filter(username="bad_sn").exists())
+        events = Event.objects.filter(
+            action=EventAction.CONFIGURATION_ERROR,
+            context__message__startswith="Failed to create user",
+        )
+        self.assertEqual(events.count(), 1)
+        self.assertEqual(events.first().context["dn"], bad_dn)
+
+    def test_sync_users_duplicate(self):
+        """Test that for duplicate entries, the LDAP data of the last one is used"""
+        self.source.property_mappings.set(
+            LDAPPropertyMapping.objects.filter(
+                Q(managed__startswith="goauthentik.io/sources/ldap/default")
+                | Q(managed__startswith="goauthentik.io/sources/ldap/ms")
+            )
+        )
+        uniq = generate_id()
+        username = generate_id()
+        page = []
+        for idx, uac in enumerate(
+            [
+                UserAccountControl.NORMAL_ACCOUNT,
+                UserAccountControl.ACCOUNTDISABLE + UserAccountControl.NORMAL_ACCOUNT,
+            ]
+        ):
+            dn = f"cn=user{idx},ou=users,dc=goauthentik,dc=io"
+            page.append(
+                {
+                    "dn": dn,
+                    "attributes": {
+                        "objectSid": uniq,
+                        "sAMAccountName": username,
+                        "name": username,
+                        "distinguishedName": dn,
+                        "userAccountControl": uac,
+                    },
+                }
+            )
+        self.assertEqual(UserLDAPSynchronizer(self.source).sync(page), 1)
+        user = User.objects.get(username=username)
+        self.assertFalse(user.is_active)
+        self.assertEqual(user.attributes["distinguishedName"], page[1]["dn"])
+
+    def test_sync_users_ad_resync(self):
+        """Test that syncing the same users again updates them instead of duplicating them"""
+        self.source.property_mappings.set(
+            LDAPPropertyMapping.objects.filter(
+                Q(managed__startswith="goauthentik.io/sources/ldap/default")
+                | Q(managed__startswith="goauthentik.io/sources/ldap/ms")
+            )
+        )
+        connection = MagicMock(return_value=mock_ad_connection(LDAP_PASSWORD))
+        with patch("authentik.sources.ldap.models.LDAPSource.connection", connection):
+            UserLDAPSynchronizer(self.source).sync_full()
+            users = User.objects.filter(attributes__ldap_uniq__isnull=False)
+            count = users.count()
+            self.assertGreater(count, 0)
+            UserLDAPSynchronizer(self.source).sync_full()
+            self.assertEqual(users.count(), count)
+
+    def test_sync_users_openldap_update_conflict(self):
+        """Test that an update that conflicts only fails itself and doesn't prevent the
+        other users from being updated"""
+        self.source.object_uniqueness_field = "uid"
+        self.source.property_mappings.set(
+            LDAPPropertyMapping.objects.filter(
+                Q(managed__startswith="goauthentik.io/sources/ldap/default")
+                | Q(managed__startswith="goauthentik.io/sources/ldap/openldap")
+            )
+        )
+        connection = MagicMock(return_value=mock_slapd_connection(LDAP_PASSWORD))
+        renamed = User.objects.create(
+            username=generate_id(), attributes={"ldap_uniq": "unique-test2222"}
+        )
+        conflicting = User.objects.create(
+            username=generate_id(), attributes={"ldap_uniq": "user0_sn"}
+        )
+        # Not linked to the LDAP user, so renaming `conflicting` to it fails
+        User.objects.create(username="user0_sn")
+        with patch("authentik.sources.ldap.models.LDAPSource.connection", connection):
+            UserLDAPSynchronizer(self.source).sync_full()
+        renamed.refresh_from_db()
+        self.assertEqual(renamed.username, "unique-test2222")
+        old_username = conflicting.username
+        conflicting.refresh_from_db()
+        self.assertEqual(conflicting.username, old_username)
+        events = Event.objects.filter(
+            action=EventAction.CONFIGURATION_ERROR,
+            context__message__startswith="Failed to create user",
+        )
+        self.assertEqual(events.count(), 1)
+        self.assertEqual(events.first().context["dn"], "cn=user0,ou=users,dc=goauthentik,dc=io")
+
+    def test_bulk_update_update_fields(self):
+        """Test that post_save gets all changed model fields of a bulk update"""
+        user_sync = UserLDAPSynchronizer(self.source)
+        user_a = User.objects.create(username=generate_id())
+        user_b = User.objects.create(username=generate_id())
+        username = generate_id()
+        fields = user_sync.update_attributes(user_a, {"name": "foo"})
+        fields |= user_sync.update_attributes(user_b, {"username": username, "path": "foo/bar"})
+        receiver = MagicMock()
+        post_save.connect(receiver, sender=User, weak=False)
+        try:
+            # Keys that aren't model fields are not passed on
+            results = user_sync.bulk_update_objects(
+                User, [user_a, user_b], fields | {"not_a_field"}
+            )
+        finally:
+            post_save.disconnect(receiver, sender=User)
+        self.assertEqual(results, [(user_a, None), (user_b, None)])
+        self.assertEqual(receiver.call_count, 2)
+        for call in receiver.call_args_list:
+            self.assertFalse(call.kwargs["created"])
+            self.assertEqual(call.kwargs["update_fields"], frozenset({"name", "username", "path"}))
+        user_a.refresh_from_db()
+        user_b.refresh_from_db()
+        self.assertEqual(user_a.name, "foo")
+        self.assertEqual(user_b.username, username)
+        self.assertEqual(user_b.path, "foo/bar")
+
+    def test_update_attributes_changed(self):
+        """Test that only changed fields are returned"""
+        user = User.objects.create(username=generate_id(), attributes={"foo": ["bar"]})
+        user_sync = UserLDAPSynchronizer(self.source)
+        self.assertEqual(
+            user_sync.update_attributes(
+                user, {"username": user.username, "attributes": {"foo": ["bar"]}}
+            ),
+            set(),
+        )
+        self.assertEqual(
+            user_sync.update_attributes(user, {"name": "baz", "attributes": {"foo": ["qux"]}}),
+            {"name", "attributes"},
+        )
+        self.assertEqual(user.name, "baz")
+        self.assertEqual(user.attributes, {"foo": ["bar", "qux"]})
+        # Lists are merged, so a list missing a value that's already stored doesn't change it
+        self.assertEqual(user_sync.update_attributes(user, {"attributes": {"foo": ["qux"]}}), set())
+        self.assertEqual(user.attributes, {"foo": ["bar", "qux"]})
+
     def test_sync_users_openldap(self):
         """Test user sync"""
         self.source.object_uniqueness_field = "uid"
@@ -263,3 +479,23 @@ class LDAPSyncTests(TestCase):
         connection = MagicMock(return_value=mock_slapd_connection(LDAP_PASSWORD))
         with patch("authentik.sources.ldap.models.LDAPSource.connection", connection):
             ldap_sync_all.delay().get()
+
+    def test_connectivity_check_all(self):
+        """Test that the connectivity check without a source checks all enabled sources"""
+        enabled = LDAPSource.objects.create(
+            name=generate_id(), slug=generate_id(), base_dn="dc=goauthentik,dc=io"
+        )
+        disabled = LDAPSource.objects.create(
+            name=generate_id(),
+            slug=generate_id(),
+            base_dn="dc=goauthentik,dc=io",
+            enabled=False,
+        )
+        status = {"__all__": {"status": "ok"}}
+        check = MagicMock(return_value=status)
+        with patch("authentik.sources.ldap.models.LDAPSource.check_connection", check):
+            ldap_connectivity_check.delay().get()
+        self.assertEqual(check.call_count, 2)
+        self.assertEqual(cache.get(CACHE_KEY_STATUS + self.source.slug), status)
+        self.assertEqual(cache.get(CACHE_KEY_STATUS + enabled.slug), status)
+        self.assertIsNone(cache.get(CACHE_KEY_STATUS + disabled.slug))